@@ -1,11 +1,30 @@
 from .browser import ZopharBrowser
 from .parsers import AudioFormat, GameListPage, GamePage, InfoPage, ParseError
+from .profiling import MemoryProfiler, MemoryStats
+from .sync import SyncZopharBrowser
+from .transport import (
+    HttpTransport,
+    RecordingTransport,
+    ReplayTransport,
+    Response,
+    ThrottledTransport,
+    Transport,
+)
 
 __all__ = [
     "AudioFormat",
     "GameListPage",
     "GamePage",
+    "HttpTransport",
     "InfoPage",
+    "MemoryProfiler",
+    "MemoryStats",
     "ParseError",
+    "RecordingTransport",
+    "ReplayTransport",
+    "Response",
+    "SyncZopharBrowser",
+    "ThrottledTransport",
+    "Transport",
     "ZopharBrowser",
 ]
@@ -1,27 +1,526 @@
+import argparse
 import asyncio
+import contextlib
+import json
 import logging
+import os
+import sys
+from pathlib import Path
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Final,
+    Iterable,
+    Iterator,
+)
 
-from .browser import ZopharBrowser
-from .parsers import ParseError
+import aiohttp
 
-logging.basicConfig(level=logging.DEBUG)
+from .browser import PageLink, ZopharBrowser
+from .codec import json_default
+from .parsers import AudioFormat, GameListPage, InfoPage, ParseError
+from .profiling import MemoryProfiler
+from .proxy import ZopharProxy
+from .transport import (
+    HttpTransport,
+    RecordingTransport,
+    ReplayTransport,
+    ThrottledTransport,
+    Transport,
+)
 
+_LOGGER: Final = logging.getLogger(__package__)
 
-async def main():
-    async with ZopharBrowser() as cli:
-        print(f"Available platforms: {cli.consoles}\n")
-        print(f"Menu: {cli.menu}\n")
+_CHUNK_SIZE: Final = 64 * 1024
+
+type _Handler = Callable[[str, int], Awaitable[Iterable[str]]]
+"""Link handler. Returns child links to process."""
+
+type _Command = Callable[
+    [
+        ZopharBrowser,
+        aiohttp.ClientSession,
+        ThrottledTransport,
+        argparse.Namespace,
+    ],
+    Awaitable[None],
+]
+"""Subcommand entry point"""
+
+
+class _OutputError(Exception):
+    """Standard output is closed or failed. Stops processing."""
+
+
+def _write(line: str) -> None:
+    try:
+        print(line, flush=True)
+
+    except OSError as e:
+        raise _OutputError(e) from e
+
+
+def _emit(link: str, type: str, data: Any) -> None:
+    """Writes one NDJSON record to standard output."""
+
+    record = {"link": link, "type": type, "data": data}
+
+    _write(json.dumps(record, default=json_default, ensure_ascii=False))
+
+
+def _emit_error(link: str, error: Exception) -> None:
+    record = {"link": link, "error": str(error) or type(error).__name__}
+
+    _write(json.dumps(record, ensure_ascii=False))
+
+
+async def _read_links(files: list[str]) -> AsyncIterator[str]:
+    """
+    Reads links from files line by line. `-` is standard input. Lines are
+    read in thread, so event loop is not blocked by slow producers.
+    """
+
+    for file in files or ["-"]:
+        if file == "-":
+            f = contextlib.nullcontext(sys.stdin)
+
+        else:
+            f = await asyncio.to_thread(open, file, encoding="utf-8")
+
+        with f as lines:
+            while line := await asyncio.to_thread(lines.readline):
+                if (link := line.strip()) and not link.startswith("#"):
+                    yield link
+
+
+async def _iter_links(links: Iterable[str]) -> AsyncIterator[str]:
+    for x in links:
+        yield x
+
+
+async def _pool(
+    links: AsyncIterator[str],
+    handler: _Handler,
+    jobs: int,
+) -> None:
+    """
+    Processes links by pool of workers as soon as they are read. Handler
+    errors are written to output and do not stop processing. Output errors
+    stop all workers.
+
+    Raises:
+        _OutputError: Standard output is closed.
+    """
+
+    queue: asyncio.Queue[tuple[str, int]] = asyncio.Queue()
+    # Limits input links waiting in queue. Child links are not limited,
+    # since workers must never block on queue.
+    inputs = asyncio.Semaphore(2 * jobs)
+
+    async def producer() -> None:
+        async for link in links:
+            await inputs.acquire()
+            queue.put_nowait((link, 0))
+
+    async def worker() -> None:
+        while True:
+            link, depth = await queue.get()
 
-        while link := input(
-            "Enter URL (absolute or relative) or empty to exit: "
-        ):
             try:
-                result = await cli.page(link)
+                children = await handler(link, depth)
+
+            except _OutputError:
+                raise
+
+            except Exception as e:
+                _LOGGER.debug("Failed to process '%s'.", link, exc_info=True)
+                _emit_error(link, e)
+                children = ()
+
+            finally:
+                if depth == 0:
+                    inputs.release()
+
+            for x in children:
+                queue.put_nowait((x, depth + 1))
+
+            queue.task_done()
+
+    try:
+        # Failed worker cancels pool. Finished pool cancels workers.
+        async with asyncio.TaskGroup() as tg:
+            workers = [tg.create_task(worker()) for _ in range(jobs)]
+
+            await producer()
+            await queue.join()
+
+            for x in workers:
+                x.cancel()
+
+    except* _OutputError as e:
+        raise e.exceptions[0] from None
+
+
+async def _gamelist_pages(
+    browser: ZopharBrowser,
+    link: PageLink,
+) -> AsyncIterator[GameListPage]:
+    """Yields pages of game list in order of completion."""
+
+    yield (page := await browser.gamelist_page(link, npage=1))
+
+    tasks = [
+        asyncio.ensure_future(browser.gamelist_page(link, npage=n))
+        for n in range(2, page.total_pages + 1)
+    ]
+
+    try:
+        for x in asyncio.as_completed(tasks):
+            yield await x
+
+    finally:
+        for x in tasks:
+            x.cancel()
+
+
+async def _pages(
+    browser: ZopharBrowser,
+    session: aiohttp.ClientSession,
+    transport: ThrottledTransport,
+    args: argparse.Namespace,
+) -> None:
+    async def handler(link: str, depth: int) -> Iterable[str]:
+        page = await browser.page(link)
+        _emit(link, type(page).__name__, page)
+
+        return ()
+
+    await _pool(_read_links(args.files), handler, args.jobs)
+
+
+async def _gamelist(
+    browser: ZopharBrowser,
+    session: aiohttp.ClientSession,
+    transport: ThrottledTransport,
+    args: argparse.Namespace,
+) -> None:
+    async def handler(link: str, depth: int) -> Iterable[str]:
+        async for page in _gamelist_pages(browser, link):
+            for x in page.entries:
+                _emit(link, type(x).__name__, x)
+
+        return ()
+
+    await _pool(_read_links(args.files), handler, args.jobs)
+
+
+async def _crawl(
+    browser: ZopharBrowser,
+    session: aiohttp.ClientSession,
+    transport: ThrottledTransport,
+    args: argparse.Namespace,
+) -> None:
+    seen: set[str] = set()
+
+    def unseen(links: Iterable[str]) -> Iterator[str]:
+        for x in links:
+            if x not in seen:
+                seen.add(x)
+                yield x
+
+    async def unseen_inputs(links: AsyncIterator[str]) -> AsyncIterator[str]:
+        async for x in links:
+            if x not in seen:
+                seen.add(x)
+                yield x
+
+    async def handler(link: str, depth: int) -> Iterable[str]:
+        children: list[str] = []
+        page = await browser.page(link)
+
+        if isinstance(page, GameListPage):
+            async for x in _gamelist_pages(browser, link):
+                _emit(link, type(x).__name__, x)
+                children.extend(y.path for y in x.entries)
+
+        else:
+            _emit(link, type(page).__name__, page)
+
+            if isinstance(page, InfoPage):
+                children.extend(x.path for x in page.entries)
+
+        if args.depth is not None and depth >= args.depth:
+            return ()
+
+        return list(unseen(children))
+
+    if args.menu:
+        menu = [x.path for items in browser.menu.values() for x in items]
+        links = _iter_links(menu)
+
+    else:
+        links = _read_links(args.files)
+
+    await _pool(unseen_inputs(links), handler, args.jobs)
+
+
+async def _download(
+    browser: ZopharBrowser,
+    session: aiohttp.ClientSession,
+    transport: ThrottledTransport,
+    args: argparse.Namespace,
+) -> None:
+    output: Path = args.output
+    output.mkdir(parents=True, exist_ok=True)
+    format = AudioFormat(args.format)
+
+    async def handler(link: str, depth: int) -> Iterable[str]:
+        page = await browser.gamepage(link)
+
+        if (url := page.archives.get(format)) is None:
+            raise ParseError(f"No {format.name} archive for '{page.name}'.")
+
+        path, size = output / url.name, 0
+        part = path.with_name(f"{path.name}.part")
+
+        try:
+            # Archives are binary and streamed, so only throttled by transport.
+            async with transport.throttle(), session.get(url) as x:
+                x.raise_for_status()
+
+                with part.open("wb") as f:
+                    async for chunk in x.content.iter_chunked(_CHUNK_SIZE):
+                        size += await asyncio.to_thread(f.write, chunk)
+
+            part.replace(path)
+
+        except BaseException:
+            # Truncated archive must not look complete.
+            part.unlink(missing_ok=True)
+            raise
+
+        _emit(link, "Download", {"url": url, "path": str(path), "size": size})
+
+        return ()
+
+    await _pool(_read_links(args.files), handler, args.jobs)
+
+
+async def _shell(
+    browser: ZopharBrowser,
+    session: aiohttp.ClientSession,
+    transport: ThrottledTransport,
+    args: argparse.Namespace,
+) -> None:
+    print(f"Available platforms: {browser.consoles}\n")
+    print(f"Menu: {browser.menu}\n")
+
+    while link := input("Enter URL (absolute or relative) or empty to exit: "):
+        try:
+            result = await browser.page(link)
+
+        except ParseError as e:
+            result = f"Error occured: {e}"
+
+        print(f"\n{result}\n")
+
+
+async def _serve(
+    browser: ZopharBrowser,
+    session: aiohttp.ClientSession,
+    transport: ThrottledTransport,
+    args: argparse.Namespace,
+) -> None:
+    async with ZopharProxy(browser, args.cache, session=session) as proxy:
+        await proxy.start(args.host, args.port)
+        await asyncio.Event().wait()
+
+
+def _parser() -> argparse.ArgumentParser:
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=4,
+        help="maximum number of concurrent requests (default: %(default)s)",
+    )
+    common.add_argument(
+        "-r",
+        "--rate",
+        type=float,
+        help="maximum number of requests per second (default: unlimited)",
+    )
+    common.add_argument(
+        "--record",
+        type=Path,
+        metavar="ARCHIVE",
+        help="record all responses to archive",
+    )
+    common.add_argument(
+        "--replay",
+        type=Path,
+        metavar="ARCHIVE",
+        help="serve responses from archive instead of network",
+    )
+    common.add_argument(
+        "--profile",
+        action="store_true",
+        help="print memory profile of operations to standard error (slow)",
+    )
+    common.add_argument(
+        "-v",
+        "--verbose",
+        action="store_true",
+        help="enable debug logging to standard error",
+    )
+
+    files = argparse.ArgumentParser(add_help=False)
+    files.add_argument(
+        "files",
+        nargs="*",
+        metavar="FILE",
+        help="files with links, one per line (default: standard input)",
+    )
+
+    parser = argparse.ArgumentParser(
+        prog="zophar",
+        description="Zophar's Domain Music browser. Writes NDJSON records.",
+    )
+    commands = parser.add_subparsers(metavar="COMMAND", required=True)
+
+    def add(
+        name: str,
+        command: _Command,
+        help: str,
+        *parents: argparse.ArgumentParser,
+    ) -> argparse.ArgumentParser:
+        x = commands.add_parser(name, help=help, parents=[common, *parents])
+        x.set_defaults(command=command)
+        return x
+
+    add("pages", _pages, "parse pages by links", files)
+    add("gamelist", _gamelist, "scrape entries of game lists", files)
+
+    x = add("crawl", _crawl, "walk pages tree starting from links", files)
+    x.add_argument(
+        "-d",
+        "--depth",
+        type=int,
+        help="maximum depth of walking (default: unlimited)",
+    )
+    x.add_argument(
+        "-m",
+        "--menu",
+        action="store_true",
+        help="start from main menu items instead of links",
+    )
+
+    x = add("download", _download, "download archives of game pages", files)
+    x.add_argument(
+        "-f",
+        "--format",
+        choices=list(AudioFormat),
+        default=AudioFormat.MP3.value,
+        help="archive audio format (default: %(default)s)",
+    )
+    x.add_argument(
+        "-o",
+        "--output",
+        type=Path,
+        default=Path(),
+        help="output directory (default: current)",
+    )
+
+    x = add("serve", _serve, "run local streaming proxy server")
+    x.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="listening address (default: %(default)s)",
+    )
+    x.add_argument(
+        "-p",
+        "--port",
+        type=int,
+        default=8080,
+        help="listening port (default: %(default)s)",
+    )
+    x.add_argument(
+        "-c",
+        "--cache",
+        type=Path,
+        default=Path("zophar-cache"),
+        help="tracks cache directory (default: %(default)s)",
+    )
+
+    add("shell", _shell, "interactive mode")
+
+    return parser
+
+
+async def _run(args: argparse.Namespace) -> None:
+    async with contextlib.AsyncExitStack() as stack:
+        session = await stack.enter_async_context(aiohttp.ClientSession())
+
+        transport: Transport
+
+        if args.replay:
+            transport = ReplayTransport.load(args.replay)
+
+        else:
+            transport = HttpTransport(session)
+
+        if args.record:
+            transport = recorder = RecordingTransport(transport)
+            stack.callback(recorder.save, args.record)
+
+        transport = ThrottledTransport(
+            transport, limit=args.jobs, rate=args.rate
+        )
+
+        if args.profile:
+            profiler = stack.enter_context(MemoryProfiler())
+            stack.callback(lambda: print(profiler.report(), file=sys.stderr))
+
+        else:
+            profiler = None
+
+        browser = ZopharBrowser(transport=transport, profiler=profiler)
+        await stack.enter_async_context(browser)
+
+        await args.command(browser, session, transport, args)
+
+
+def main() -> None:
+    """Command line interface entry point"""
+
+    args = (parser := _parser()).parse_args()
+
+    if args.jobs < 1:
+        parser.error("number of jobs must be positive")
+
+    if args.command is _download and (args.record or args.replay):
+        # Archives are streamed by session and can not be recorded.
+        parser.error("--record and --replay are not supported by download")
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.WARNING
+    )
+
+    try:
+        asyncio.run(_run(args))
 
-            except ParseError as e:
-                result = f"Error occured: {e}"
+    except KeyboardInterrupt:
+        pass
 
-            print(f"\n{result}\n")
+    except _OutputError:
+        # Reader of output exited (`| head`). Output can not be flushed at
+        # exit, so it is redirected to null device.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
 
 
-asyncio.run(main())
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import asyncio
+import dataclasses as dc
 import itertools as it
 from typing import AsyncIterator, Final, Iterable, overload
 
@@ -18,6 +19,8 @@ from .parsers import (
     parse_page,
     parse_searchpage,
 )
+from .profiling import MemoryProfiler, profile
+from .transport import HttpTransport, Transport
 
 type PageLink = Browsable | URL | str
 """Supported page link types"""
@@ -41,31 +44,63 @@ def _make_url(link: PageLink, page: int | None = None) -> URL:
     return _BASE_URL.join(link)
 
 
+def _normalize_query(context: str) -> str:
+    # Search is case insensitive. Collapses whitespaces too.
+    return " ".join(context.split()).lower()
+
+
+def _search_link(context: str, console_id: str) -> URL:
+    query = {"search": context}
+
+    if console_id != "0":
+        query["search_consoleid"] = console_id
+
+    return URL.build(path="search", query=query)
+
+
 class ZopharBrowser:
     """Zophar's Game Music browser"""
 
-    _cli: aiohttp.ClientSession
-    _close_connector: bool
+    _transport: Transport
+    _close_transport: bool
     _menu: Menu
     _consoles: Consoles
     _cache: dict[str, PagesSupported]
+    _filtered: dict[str, GameListPage]
+    _pending: dict[str, asyncio.Future[PagesSupported]]
+    _profiler: MemoryProfiler | None
 
     def __init__(
         self,
         *,
         session: aiohttp.ClientSession | None = None,
+        transport: Transport | None = None,
+        profiler: MemoryProfiler | None = None,
     ) -> None:
-        self._cli = session or aiohttp.ClientSession()
-        self._close_connector = session is None
+        """
+        Args:
+            session: HTTP client session. Exclusive with `transport`.
+            transport: Custom transport (recording, replaying, etc.).
+            profiler: Optional memory profiler of operations.
+        """
+
+        if session is not None and transport is not None:
+            raise ValueError("Only one of 'session' or 'transport' is allowed.")
+
+        self._transport = transport or HttpTransport(session)
+        self._close_transport = transport is None
         self._menu = {}
         self._consoles = {}
         self._cache = {}
+        self._filtered = {}
+        self._pending = {}
+        self._profiler = profiler
 
     async def __aenter__(self):
         try:
             await self.open()
 
-        except aiohttp.ClientError:
+        except (aiohttp.ClientError, ParseError):
             await self.close()
             raise
 
@@ -80,18 +115,18 @@ class ZopharBrowser:
         hardware platforms.
         """
 
-        url = _make_url("search")
+        x = await self._transport.get(_make_url("search"))
 
-        async with self._cli.get(url) as x:
-            html = await x.text()
+        if x.status != 200:
+            raise ParseError("Search page not found.")
 
-        self._menu, self._consoles = parse_searchpage(html)
+        self._menu, self._consoles = parse_searchpage(x.text)
 
     async def close(self):
-        """Closes HTTPS client session"""
+        """Closes own transport and HTTPS client session"""
 
-        if self._close_connector:
-            await self._cli.close()
+        if self._close_transport:
+            await self._transport.close()
 
     @property
     def menu(self) -> Menu:
@@ -105,6 +140,15 @@ class ZopharBrowser:
 
         return list(self._consoles)
 
+    @property
+    def session(self) -> aiohttp.ClientSession | None:
+        """HTTP client session of network transport. `None` for others."""
+
+        if isinstance(self._transport, HttpTransport):
+            return self._transport.session
+
+        return None
+
     @overload
     async def page(
         self,
@@ -140,31 +184,51 @@ class ZopharBrowser:
         link: PageLink | None = None,
         *,
         npage: int | None = None,
+    ) -> PagesSupported:
+        with profile(self._profiler, "page") as m:
+            m.classify(page := await self._page(link, npage))
+
+        return page
+
+    async def _page(
+        self,
+        link: PageLink | None,
+        npage: int | None,
     ) -> PagesSupported:
         url = _make_url(link or _RANDOM_PATH, npage)
 
         if url.raw_path == _RANDOM_PATH:
             # URL is random game page, gets new URL to use caching.
-            async with self._cli.get(url, allow_redirects=False) as x:
-                if x.status != 302:
-                    raise ParseError(
-                        "Could not get random game. No redirection from server."
-                    )
+            x = await self._transport.get(url, allow_redirects=False)
 
-                location = x.headers["location"]
+            if x.status != 302 or x.location is None:
+                raise ParseError(
+                    "Could not get random game. No redirection from server."
+                )
 
-            url = URL(location).with_scheme("https")
+            url = URL(x.location).with_scheme("https")
 
         if page := self._cache.get(path_qs := url.path_qs):
             return page
 
-        async with self._cli.get(url, allow_redirects=False) as x:
-            if x.status != 200:
-                raise ParseError("Page not found.")
+        if (future := self._pending.get(path_qs)) is None:
+            # Concurrent requests of the same page share one load.
+            future = asyncio.ensure_future(self._load(url))
+            future.add_done_callback(lambda _: self._pending.pop(path_qs))
+            self._pending[path_qs] = future
+
+        return await asyncio.shield(future)
+
+    async def _load(self, url: URL) -> PagesSupported:
+        x = await self._transport.get(url, allow_redirects=False)
+
+        if x.status != 200:
+            raise ParseError("Page not found.")
 
-            html = await x.text()
+        with profile(self._profiler, "parse", sync=True) as m:
+            m.classify(page := parse_page(x.text))
 
-        self._cache[path_qs] = page = parse_page(html)
+        self._cache[url.path_qs] = page
 
         return page
 
@@ -221,21 +285,20 @@ class ZopharBrowser:
             Game entries list.
         """
 
-        page = await self.gamelist_page(link, npage=1)
+        with profile(self._profiler, "gamelist") as m:
+            m.classify(GameListPage)
+            page = await self.gamelist_page(link, npage=1)
 
-        if (total := page.total_pages) < 2:
-            return page.entries
+            async with asyncio.TaskGroup() as tg:
+                tasks = [
+                    tg.create_task(self.gamelist_page(link, npage=n))
+                    for n in range(2, page.total_pages + 1)
+                ]
 
-        async with asyncio.TaskGroup() as tg:
-            tasks = [
-                tg.create_task(self.gamelist_page(link, npage=n))
-                for n in range(2, total + 1)
-            ]
+            # Cached pages entries must not be modified.
+            pages = [page, *(x.result() for x in tasks)]
 
-        for x in tasks:
-            page.entries.extend(x.result().entries)
-
-        return page.entries
+            return [x for page in pages for x in page.entries]
 
     async def infopage(self, link: PageLink) -> InfoPage:
         """
@@ -283,10 +346,30 @@ class ZopharBrowser:
             List of `GamePage` instances.
         """
 
-        async with asyncio.TaskGroup() as tg:
-            tasks = [tg.create_task(self.gamepage(x)) for x in links]
+        with profile(self._profiler, "gamepages") as m:
+            m.classify(GamePage)
+            async with asyncio.TaskGroup() as tg:
+                tasks = [tg.create_task(self.gamepage(x)) for x in links]
+
+            return [x.result() for x in tasks]
 
-        return [x.result() for x in tasks]
+    def _console_id(self, console: str | None) -> str:
+        if not console:
+            return "0"
+
+        if (id := self._consoles.get(console)) is None:
+            raise ValueError(f"Unknown console '{console}'.")
+
+        return id
+
+    def _console_path(self, console: str) -> str | None:
+        # Games paths are prefixed with path of console menu item.
+        for items in self._menu.values():
+            for x in items:
+                if x.name == console:
+                    return x.path
+
+        return None
 
     async def search(
         self,
@@ -296,26 +379,81 @@ class ZopharBrowser:
     ) -> GameListPage:
         """
         Search games by context and optionally filtered by platform ID.
+        Context is case and whitespace insensitive.
+
+        Filtered results are derived from cached unfiltered results without
+        request if console menu item has the same name as console in search
+        dropdown. Derived pages have empty description, since text of server
+        is known for real results only. They are kept apart from pages cache.
 
         Args:
             context: Game search context.
-            platform: Filter by hardware platform (default: All).
+            console: Filter by hardware platform (default: All).
 
         Returns:
             Instance of `GameListPage`.
         """
 
-        query, id = {"search": context}, "0"
+        context, id = _normalize_query(context), self._console_id(console)
+        url = _make_url(link := _search_link(context, id))
 
-        if console and (id := self._consoles.get(console)) is None:
-            raise ValueError(f"Unknown console '{console}'.")
+        if id != "0" and (path_qs := url.path_qs) not in self._cache:
+            if page := self._filtered.get(path_qs):
+                return page
+
+            # Filter cached unfiltered results if console path is known.
+            unfiltered = _make_url(_search_link(context, "0"))
 
-        if id != "0":
-            query["search_consoleid"] = id
+            if (page := self._cache.get(unfiltered.path_qs)) and (
+                prefix := self._console_path(console)
+            ):
+                assert isinstance(page, GameListPage)
 
-        link = URL.build(path="search", query=query)
+                entries = [
+                    x for x in page.entries if x.path.startswith(f"{prefix}/")
+                ]
+
+                page = dc.replace(page, entries=entries, description="")
+                self._filtered[path_qs] = page
+
+                return page
 
         page = await self.gamelist_page(link)
         assert page.total_pages == 1
 
         return page
+
+    async def search_many(
+        self,
+        contexts: Iterable[str],
+        *,
+        console: str | None = None,
+    ) -> list[GameEntry]:
+        """
+        Search games by many contexts concurrently. Contexts are normalized
+        and deduplicated before searching.
+
+        Args:
+            contexts: Iterable of game search contexts.
+            console: Filter by hardware platform (default: All).
+
+        Returns:
+            Merged list of unique game entries in order of contexts.
+        """
+
+        self._console_id(console)
+        contexts = dict.fromkeys(map(_normalize_query, contexts))
+
+        async with asyncio.TaskGroup() as tg:
+            tasks = [
+                tg.create_task(self.search(x, console=console))
+                for x in contexts
+            ]
+
+        entries: dict[str, GameEntry] = {}
+
+        for x in tasks:
+            for entry in x.result().entries:
+                entries.setdefault(entry.path, entry)
+
+        return list(entries.values())
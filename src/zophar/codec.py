@@ -0,0 +1,421 @@
+"""
+Compact binary codec of parsed pages.
+
+Encoded page is a tree of records. Each record is a table of 32-bit slots.
+Slot holds scalar value or absolute offset of string, list or nested record
+(zero offset means `None`). That layout allows lazy reading of some fields
+directly from shared memory or `mmap` without decoding whole page. Full
+decoding is not faster than `pickle`, so codec pays off for partial reads only.
+"""
+
+from __future__ import annotations
+
+import abc
+import dataclasses as dc
+import datetime as dt
+import struct
+from collections.abc import Buffer
+from typing import (
+    Any,
+    Callable,
+    Final,
+    Iterator,
+    Mapping,
+    Sequence,
+    overload,
+)
+
+from yarl import URL
+
+from .parsers import (
+    AudioFormat,
+    AudioTrack,
+    Browsable,
+    GameEntry,
+    GameListPage,
+    GamePage,
+    InfoPage,
+    PagesSupported,
+)
+from .parsers.types import PageType
+
+_MAGIC: Final = b"ZPHR"
+_VERSION: Final = 1
+
+_HEADER: Final = struct.Struct("<4sBB2x")
+_U32: Final = struct.Struct("<I")
+
+_FORMATS: Final = list(AudioFormat)
+_PAGE_TYPES: Final = list(PageType)
+
+
+class _Writer:
+    _buf: bytearray
+
+    def __init__(self) -> None:
+        self._buf = bytearray()
+
+    def getvalue(self) -> bytes:
+        return bytes(self._buf)
+
+    def header(self, type: PageType) -> None:
+        self._buf += _HEADER.pack(_MAGIC, _VERSION, _PAGE_TYPES.index(type))
+
+    def reserve(self, n: int) -> int:
+        offset = len(self._buf)
+        self._buf += bytes(n * _U32.size)
+
+        return offset
+
+    def patch(self, table: int, index: int, value: int) -> None:
+        _U32.pack_into(self._buf, table + index * _U32.size, value)
+
+    def string(self, value: str) -> int:
+        data, offset = value.encode(), len(self._buf)
+        self._buf += _U32.pack(len(data))
+        self._buf += data
+
+        return offset
+
+
+def _u32(buf: memoryview, offset: int) -> int:
+    return _U32.unpack_from(buf, offset)[0]
+
+
+def _str(buf: memoryview, offset: int) -> str:
+    start = offset + _U32.size
+
+    return str(buf[start : start + _u32(buf, offset)], "utf-8")
+
+
+class _Kind(abc.ABC):
+    """Field codec. Converts value to slot and back."""
+
+    @abc.abstractmethod
+    def encode(self, w: _Writer, value: Any) -> int: ...
+
+    @abc.abstractmethod
+    def decode(self, buf: memoryview, slot: int) -> Any: ...
+
+    def load(self, buf: memoryview, slot: int) -> Any:
+        """Decodes value eagerly. Nested entities are materialized."""
+
+        return self.decode(buf, slot)
+
+
+class _Int(_Kind):
+    def encode(self, w: _Writer, value: int) -> int:
+        return value
+
+    def decode(self, buf: memoryview, slot: int) -> int:
+        return slot
+
+
+class _Str(_Kind):
+    def encode(self, w: _Writer, value: str | None) -> int:
+        return 0 if value is None else w.string(value)
+
+    def decode(self, buf: memoryview, slot: int) -> str | None:
+        return _str(buf, slot) if slot else None
+
+
+class _Url(_Kind):
+    def encode(self, w: _Writer, value: URL | None) -> int:
+        return 0 if value is None else w.string(str(value))
+
+    def decode(self, buf: memoryview, slot: int) -> URL | None:
+        return URL(_str(buf, slot), encoded=True) if slot else None
+
+
+class _Duration(_Kind):
+    # Stored in milliseconds.
+    def encode(self, w: _Writer, value: dt.timedelta) -> int:
+        return round(value.total_seconds() * 1000)
+
+    def decode(self, buf: memoryview, slot: int) -> dt.timedelta:
+        return dt.timedelta(milliseconds=slot)
+
+
+class _Archives(_Kind):
+    # Table of URL slots indexed by audio format.
+    def encode(self, w: _Writer, value: dict[AudioFormat, URL]) -> int:
+        table = w.reserve(len(_FORMATS))
+
+        for format, url in value.items():
+            w.patch(table, _FORMATS.index(format), w.string(str(url)))
+
+        return table
+
+    def decode(self, buf: memoryview, slot: int) -> dict[AudioFormat, URL]:
+        result = {}
+
+        for i, format in enumerate(_FORMATS):
+            if x := _u32(buf, slot + i * _U32.size):
+                result[format] = URL(_str(buf, x), encoded=True)
+
+        return result
+
+
+class _Record(_Kind):
+    cls: type
+    fields: dict[str, tuple[int, _Kind]]
+    table: struct.Struct
+
+    def __init__(self, cls: type, **fields: _Kind) -> None:
+        names = {x.name for x in dc.fields(cls)}
+        assert names == fields.keys(), f"Incomplete schema of {cls.__name__}"
+
+        self.cls = cls
+        self.fields = {k: (i, v) for i, (k, v) in enumerate(fields.items())}
+        self.table = struct.Struct(f"<{len(fields)}I")
+
+    def encode(self, w: _Writer, value: Any) -> int:
+        table = w.reserve(len(self.fields))
+
+        for name, (i, kind) in self.fields.items():
+            w.patch(table, i, kind.encode(w, getattr(value, name)))
+
+        return table
+
+    def decode(self, buf: memoryview, slot: int) -> RecordView:
+        return RecordView(buf, slot, self)
+
+    def load(self, buf: memoryview, slot: int) -> Any:
+        slots = self.table.unpack_from(buf, slot)
+
+        return self.cls(
+            **{
+                name: kind.load(buf, slots[i])
+                for name, (i, kind) in self.fields.items()
+            }
+        )
+
+
+class _List(_Kind):
+    item: _Record
+    factory: Callable[[Iterator[Any]], Sequence[Any]]
+
+    def __init__(
+        self,
+        item: _Record,
+        factory: Callable[[Iterator[Any]], Sequence[Any]] = list,
+    ) -> None:
+        self.item = item
+        self.factory = factory
+
+    def encode(self, w: _Writer, value: Sequence[Any]) -> int:
+        table = w.reserve(len(value) + 1)
+        w.patch(table, 0, len(value))
+
+        for i, x in enumerate(value, 1):
+            w.patch(table, i, self.item.encode(w, x))
+
+        return table
+
+    def decode(self, buf: memoryview, slot: int) -> ListView:
+        return ListView(buf, slot, self.item)
+
+    def load(self, buf: memoryview, slot: int) -> Sequence[Any]:
+        n, load = _u32(buf, slot), self.item.load
+        slots = struct.unpack_from(f"<{n}I", buf, slot + _U32.size)
+
+        return self.factory(load(buf, x) for x in slots)
+
+
+class RecordView:
+    """Lazy read-only view of encoded entity. Fields are decoded on access."""
+
+    __slots__ = ("_buf", "_offset", "_record")
+
+    _buf: memoryview
+    _offset: int
+    _record: _Record
+
+    def __init__(self, buf: memoryview, offset: int, record: _Record) -> None:
+        self._buf = buf
+        self._offset = offset
+        self._record = record
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            index, kind = self._record.fields[name]
+
+        except KeyError:
+            raise AttributeError(name) from None
+
+        slot = _u32(self._buf, self._offset + index * _U32.size)
+
+        return kind.decode(self._buf, slot)
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} of {self._record.cls.__name__}>"
+
+    @property
+    def type(self) -> type:
+        """Class of encoded entity"""
+
+        return self._record.cls
+
+    def materialize(self) -> Any:
+        """Decodes all fields and returns instance of entity class."""
+
+        return self._record.load(self._buf, self._offset)
+
+
+class ListView(Sequence[RecordView]):
+    """Lazy read-only sequence of encoded entities"""
+
+    __slots__ = ("_buf", "_offset", "_item")
+
+    _buf: memoryview
+    _offset: int
+    _item: _Record
+
+    def __init__(self, buf: memoryview, offset: int, item: _Record) -> None:
+        self._buf = buf
+        self._offset = offset
+        self._item = item
+
+    def __len__(self) -> int:
+        return _u32(self._buf, self._offset)
+
+    @overload
+    def __getitem__(self, index: int) -> RecordView: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[RecordView]: ...
+
+    def __getitem__(self, index: int | slice) -> RecordView | list[RecordView]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+
+        if not 0 <= index < len(self):
+            raise IndexError("List view index out of range.")
+
+        slot = _u32(self._buf, self._offset + (index + 1) * _U32.size)
+
+        return RecordView(self._buf, slot, self._item)
+
+
+_SCHEMAS: Final[dict[PageType, _Record]] = {
+    PageType.GameListPage: _Record(
+        GameListPage,
+        entries=_List(
+            _Record(GameEntry, name=_Str(), path=_Str(), cover=_Url())
+        ),
+        title=_Str(),
+        description=_Str(),
+        page=_Int(),
+        total_pages=_Int(),
+    ),
+    PageType.GamePage: _Record(
+        GamePage,
+        name=_Str(),
+        console=_Str(),
+        cover=_Url(),
+        release_date=_Str(),
+        developer=_Str(),
+        publisher=_Str(),
+        originals=_Url(),
+        archives=_Archives(),
+        tracks=_List(
+            _Record(
+                AudioTrack, title=_Str(), length=_Duration(), mp3url=_Url()
+            ),
+            tuple,
+        ),
+    ),
+    PageType.InfoPage: _Record(
+        InfoPage,
+        entries=_List(_Record(Browsable, name=_Str(), path=_Str())),
+        description=_Str(),
+    ),
+}
+
+
+def dumps(page: PagesSupported) -> bytes:
+    """
+    Encodes page to compact binary form.
+
+    Args:
+        page: Instance of any supported page.
+
+    Returns:
+        Encoded bytes.
+    """
+
+    w, type = _Writer(), PageType[page.__class__.__name__]
+
+    w.header(type)
+    _SCHEMAS[type].encode(w, page)
+
+    return w.getvalue()
+
+
+def view(buffer: Buffer) -> RecordView:
+    """
+    Returns lazy view of encoded page. Buffer is not copied.
+
+    Args:
+        buffer: Any bytes-like object: `bytes`, `mmap`, shared memory buffer.
+
+    Returns:
+        Instance of `RecordView`.
+
+    Raises:
+        ValueError: Buffer does not contain encoded page.
+    """
+
+    buf = memoryview(buffer).cast("B")
+
+    try:
+        magic, version, type = _HEADER.unpack_from(buf)
+
+    except struct.error:
+        raise ValueError("Buffer is too small.") from None
+
+    if magic != _MAGIC:
+        raise ValueError("Not an encoded page.")
+
+    if version != _VERSION:
+        raise ValueError(f"Unsupported codec version {version}.")
+
+    if type >= len(_PAGE_TYPES):
+        raise ValueError(f"Unknown page type {type}.")
+
+    return RecordView(buf, _HEADER.size, _SCHEMAS[_PAGE_TYPES[type]])
+
+
+def loads(buffer: Buffer) -> PagesSupported:
+    """
+    Decodes page from binary form.
+
+    Args:
+        buffer: Any bytes-like object with encoded page.
+
+    Returns:
+        Instance of page entity.
+    """
+
+    return view(buffer).materialize()
+
+
+def json_default(obj: Any) -> Any:
+    """`default` hook of `json.dumps` serializing page entities."""
+
+    if dc.is_dataclass(obj):
+        return {x.name: getattr(obj, x.name) for x in dc.fields(obj)}
+
+    if isinstance(obj, URL):
+        return str(obj)
+
+    if isinstance(obj, dt.timedelta):
+        return obj.total_seconds()
+
+    if isinstance(obj, Mapping):
+        return dict(obj)
+
+    raise TypeError(f"Object of type {type(obj).__name__} is not serializable.")
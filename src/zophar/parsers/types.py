@@ -4,7 +4,7 @@ import dataclasses as dc
 import datetime as dt
 import logging
 from enum import STRICT, StrEnum, auto
-from typing import Final, Iterator, Mapping
+from typing import Callable, Final, Iterator, Mapping
 
 from yarl import URL
 
@@ -108,17 +108,33 @@ class GamePage:
     def has_format(self, format: AudioFormat) -> bool:
         return format in self.archives
 
-    def _m3u_lines(self, format: AudioFormat) -> Iterator[str]:
+    def _m3u_lines(
+        self,
+        format: AudioFormat,
+        rewrite: Callable[[URL], URL] | None,
+    ) -> Iterator[str]:
         yield "#EXTM3U"
         for track in self.tracks:
             yield f"#EXTINF:{track.length.seconds},{track.title}"
-            yield track.url(format).human_repr()
-
-    def m3u(self, format: AudioFormat = AudioFormat.MP3) -> str:
-        """Returns M3U playlist string of specified format"""
+            url = track.url(format)
+            yield (rewrite(url) if rewrite else url).human_repr()
+
+    def m3u(
+        self,
+        format: AudioFormat = AudioFormat.MP3,
+        *,
+        rewrite: Callable[[URL], URL] | None = None,
+    ) -> str:
+        """
+        Returns M3U playlist string of specified format.
+
+        Args:
+            format: Audio format.
+            rewrite: Optional mapping of tracks URLs (to proxy, etc.).
+        """
 
         if self.has_format(format):
-            return "\n".join(self._m3u_lines(format))
+            return "\n".join(self._m3u_lines(format, rewrite))
 
         raise FileNotFoundError
 
@@ -0,0 +1,288 @@
+import contextlib
+import dataclasses as dc
+import logging
+import tracemalloc
+from typing import Any, Final, Iterator, Mapping
+
+from .parsers import PagesSupported
+from .parsers.types import PageType
+
+_LOGGER: Final = logging.getLogger(__name__)
+
+type StatsKey = tuple[str, PageType | None]
+"""Operation name and type of resulting page (if any)"""
+
+
+@dc.dataclass(slots=True)
+class MemoryStats:
+    """Accumulated memory statistics of operation"""
+
+    calls: int = 0
+    """Number of measured calls"""
+    peak: int = 0
+    """Maximum peak of traced memory over calls in bytes"""
+    total_peak: int = 0
+    """Sum of peaks of all calls in bytes"""
+    size: int | None = None
+    """
+    Net size of memory allocated by calls and still alive in bytes. Measured
+    for synchronous operations only.
+    """
+    allocations: int | None = None
+    """
+    Net number of memory blocks allocated by calls and still alive. Measured
+    for synchronous operations only.
+    """
+
+    @property
+    def mean_peak(self) -> float:
+        """Mean peak of traced memory per call in bytes"""
+
+        return self.total_peak / self.calls if self.calls else 0
+
+    def merge(self, other: "MemoryStats") -> None:
+        self.calls += other.calls
+        self.peak = max(self.peak, other.peak)
+        self.total_peak += other.total_peak
+
+        if other.size is not None:
+            self.size = (self.size or 0) + other.size
+
+        if other.allocations is not None:
+            self.allocations = (self.allocations or 0) + other.allocations
+
+
+_SNAPSHOT_FILTERS: Final = (tracemalloc.Filter(False, tracemalloc.__file__),)
+
+
+def _snapshot() -> tracemalloc.Snapshot:
+    return tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+
+
+class Measurement:
+    """Single measured call. Result page may be set to classify by type."""
+
+    __slots__ = ("operation", "page_type", "_base", "_peak")
+
+    operation: str
+    page_type: PageType | None
+    _base: int
+    _peak: int
+
+    def __init__(self, operation: str) -> None:
+        self.operation = operation
+        self.page_type = None
+        self._base = self._peak = 0
+
+    def classify(self, page: PagesSupported | type[PagesSupported]) -> None:
+        """Sets type of resulting page by page or its class."""
+
+        cls = page if isinstance(page, type) else type(page)
+        self.page_type = PageType[cls.__name__]
+
+
+class MemoryProfiler:
+    """
+    Opt-in `tracemalloc` based profiler of browser operations.
+
+    Peaks of nested and concurrent operations overlap, since traced memory is
+    global for the process. Net allocated size and blocks are measured for
+    synchronous operations only, since memory of interleaving tasks can not be
+    told apart.
+    """
+
+    _stats: dict[StatsKey, MemoryStats]
+    _active: set[Measurement]
+    _started: bool
+    _snapshots: bool
+
+    def __init__(self, *, snapshots: bool = True) -> None:
+        """
+        Args:
+            snapshots: Count allocated blocks of synchronous operations by
+                snapshots. Snapshot copies all traces, so it is slow on large
+                heaps. If disabled, only net size is measured.
+        """
+
+        self._stats = {}
+        self._active = set()
+        self._started = False
+        self._snapshots = snapshots
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    @property
+    def running(self) -> bool:
+        """Memory tracing is active"""
+
+        return tracemalloc.is_tracing()
+
+    @property
+    def stats(self) -> Mapping[StatsKey, MemoryStats]:
+        """Statistics by operation and page type"""
+
+        return self._stats
+
+    def start(self) -> None:
+        """Starts memory tracing if it is not started yet."""
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started = True
+
+    def stop(self) -> None:
+        """Stops memory tracing if it was started by this profiler."""
+
+        if self._started:
+            tracemalloc.stop()
+            self._started = False
+
+    def reset(self) -> None:
+        """Clears collected statistics."""
+
+        self._stats.clear()
+
+    def _update_peaks(self) -> int:
+        current, peak = tracemalloc.get_traced_memory()
+
+        for x in self._active:
+            x._peak = max(x._peak, peak)
+
+        return current
+
+    @contextlib.contextmanager
+    def measure(
+        self,
+        operation: str,
+        *,
+        sync: bool = False,
+    ) -> Iterator[Measurement]:
+        """
+        Measures memory of code block. Does nothing if tracing is stopped.
+
+        Args:
+            operation: Operation name.
+            sync: Code block is synchronous (never awaits). Net allocated
+                size and blocks are measured only for such blocks.
+
+        Returns:
+            Context manager of `Measurement`.
+        """
+
+        m = Measurement(operation)
+
+        if not self.running:
+            yield m
+            return
+
+        before = _snapshot() if sync and self._snapshots else None
+
+        # Peak is reset for each operation. Save it for active ones before.
+        self._update_peaks()
+        tracemalloc.reset_peak()
+        m._base = m._peak = self._update_peaks()
+        self._active.add(m)
+
+        try:
+            yield m
+
+        finally:
+            current = self._update_peaks()
+            self._active.discard(m)
+
+            x = MemoryStats(
+                calls=1,
+                peak=(peak := m._peak - m._base),
+                total_peak=peak,
+            )
+
+            if before is not None:
+                diff = _snapshot().compare_to(before, "filename")
+                x.size = sum(y.size_diff for y in diff)
+                x.allocations = sum(y.count_diff for y in diff)
+
+            elif sync:
+                x.size = current - m._base
+
+            key = m.operation, m.page_type
+            self._stats.setdefault(key, MemoryStats()).merge(x)
+
+            _LOGGER.debug("Measured %s: %s", key, x)
+
+    def _aggregate(self, index: int) -> dict[Any, MemoryStats]:
+        result: dict[Any, MemoryStats] = {}
+
+        for key, x in self._stats.items():
+            result.setdefault(key[index], MemoryStats()).merge(x)
+
+        return result
+
+    def by_operation(self) -> dict[str, MemoryStats]:
+        """Statistics aggregated by operation"""
+
+        return self._aggregate(0)
+
+    def by_page_type(self) -> dict[PageType | None, MemoryStats]:
+        """Statistics aggregated by type of resulting page"""
+
+        return self._aggregate(1)
+
+    def check_budget(self, operation: str, peak: int) -> None:
+        """
+        Checks peak memory of operation.
+
+        Args:
+            operation: Operation name.
+            peak: Maximum allowed peak in bytes.
+
+        Raises:
+            MemoryError: Peak memory of operation exceeds budget.
+        """
+
+        if (x := self.by_operation().get(operation)) and x.peak > peak:
+            raise MemoryError(
+                f"Operation '{operation}' peak {x.peak} bytes exceeds "
+                f"budget of {peak} bytes."
+            )
+
+    def report(self) -> str:
+        """Returns statistics as text table."""
+
+        lines = [
+            f"{'operation':<12} {'page type':<14} {'calls':>7} "
+            f"{'peak KiB':>10} {'mean KiB':>10} {'size KiB':>10} "
+            f"{'allocs':>9}"
+        ]
+
+        for (op, type), x in sorted(
+            self._stats.items(), key=lambda x: (x[0][0], x[0][1] or "")
+        ):
+            size = "-" if x.size is None else f"{x.size / 1024:.1f}"
+            allocs = "-" if x.allocations is None else str(x.allocations)
+
+            lines.append(
+                f"{op:<12} {type or '-':<14} {x.calls:>7} "
+                f"{x.peak / 1024:>10.1f} {x.mean_peak / 1024:>10.1f} "
+                f"{size:>10} {allocs:>9}"
+            )
+
+        return "\n".join(lines)
+
+
+def profile(
+    profiler: MemoryProfiler | None,
+    operation: str,
+    *,
+    sync: bool = False,
+) -> contextlib.AbstractContextManager[Measurement]:
+    """Measures code block by optional profiler."""
+
+    if profiler is None:
+        return contextlib.nullcontext(Measurement(operation))
+
+    return profiler.measure(operation, sync=sync)
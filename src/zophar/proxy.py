@@ -0,0 +1,372 @@
+import asyncio
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import BinaryIO, Callable, Final
+
+import aiohttp
+from aiohttp import web
+from yarl import URL
+
+from .browser import ZopharBrowser
+from .codec import json_default
+from .parsers import AudioFormat, GamePage, PagesSupported, ParseError
+
+_LOGGER: Final = logging.getLogger(__name__)
+
+_CHUNK_SIZE: Final = 64 * 1024
+
+_ORIGIN_DOMAIN: Final = "zophar.net"
+
+
+def _is_origin(host: str) -> bool:
+    return host == _ORIGIN_DOMAIN or host.endswith(f".{_ORIGIN_DOMAIN}")
+
+
+def _origin(host: str) -> URL | None:
+    if _is_origin(host):
+        return URL.build(scheme="https", host=host)
+
+    return None
+
+
+class _Download:
+    """Origin fetch to disk cache. Shared by all listeners of one track."""
+
+    path: Path
+    part: Path
+    size: int
+    total: int | None
+    content_type: str
+    error: BaseException | None
+    done: bool
+    started: asyncio.Event
+    _progress: asyncio.Condition
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.part = path.with_name(f"{path.name}.part")
+        self.size = 0
+        self.total = None
+        self.content_type = "application/octet-stream"
+        self.error = None
+        self.done = False
+        self.started = asyncio.Event()
+        self._progress = asyncio.Condition()
+
+    async def _notify(self) -> None:
+        async with self._progress:
+            self._progress.notify_all()
+
+    async def run(self, session: aiohttp.ClientSession, url: URL) -> None:
+        try:
+            async with session.get(url) as x:
+                x.raise_for_status()
+
+                self.total = x.content_length
+                self.content_type = x.content_type
+                self.started.set()
+
+                with self.part.open("wb") as f:
+                    async for chunk in x.content.iter_chunked(_CHUNK_SIZE):
+                        f.write(chunk)
+                        f.flush()
+                        self.size += len(chunk)
+                        await self._notify()
+
+            # Listeners streaming from partial file keep their descriptors.
+            self.part.replace(self.path)
+
+        except BaseException as e:
+            self.error = e
+            self.part.unlink(missing_ok=True)
+
+            if not isinstance(e, (aiohttp.ClientError, OSError)):
+                raise
+
+            _LOGGER.warning("Failed to fetch '%s': %s", url, e)
+
+        finally:
+            self.done = True
+            self.started.set()
+            await self._notify()
+
+    async def wait(self, size: int) -> None:
+        """Waits until downloaded data exceeds specified size."""
+
+        async with self._progress:
+            await self._progress.wait_for(lambda: self.size > size or self.done)
+
+
+class ZopharProxy:
+    """
+    Local HTTP server proxying game pages, M3U playlists and soundtracks.
+
+    Routes:
+        `/page/{path}`: Page entity as JSON. Empty path is random game page.
+        `/playlist/{path}?format=mp3`: M3U playlist with local track URLs.
+        `/track/{host}/{path}`: Audio stream cached on disk. Supports ranges.
+
+    Streaming of track while it is fetched relies on POSIX semantics: partial
+    file is renamed or removed while listeners keep it open. On Windows that
+    fails, so wait for complete fetch there.
+    """
+
+    _browser: ZopharBrowser
+    _cli: aiohttp.ClientSession
+    _close_connector: bool
+    _origin: Callable[[str], URL | None]
+    _cache_dir: Path
+    _downloads: dict[str, _Download]
+    _tasks: set[asyncio.Task]
+    _runner: web.AppRunner | None
+
+    def __init__(
+        self,
+        browser: ZopharBrowser,
+        cache_dir: str | Path,
+        *,
+        session: aiohttp.ClientSession | None = None,
+        origin: Callable[[str], URL | None] = _origin,
+    ) -> None:
+        """
+        Args:
+            browser: Opened browser. Pages are served from its cache.
+            cache_dir: Directory of tracks disk cache.
+            session: HTTP client session for tracks fetching. Default:
+                session of browser, if it has network transport.
+            origin: Returns base URL of tracks host or `None` if host is not
+                allowed. Default: HTTPS for `zophar.net` and its subdomains.
+        """
+
+        session = session or browser.session
+
+        self._browser = browser
+        self._cli = session or aiohttp.ClientSession()
+        self._close_connector = session is None
+        self._origin = origin
+        self._cache_dir = Path(cache_dir)
+        self._downloads = {}
+        self._tasks = set()
+        self._runner = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    def make_app(self) -> web.Application:
+        """Creates web application. Can be used with any aiohttp runner."""
+
+        self._cache_dir.mkdir(parents=True, exist_ok=True)
+
+        app = web.Application()
+        app.add_routes(
+            [
+                web.get("/page/{path:.*}", self._page),
+                web.get("/playlist/{path:.+}", self._playlist),
+                web.get("/track/{host}/{path:.+}", self._track),
+            ]
+        )
+
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8080) -> None:
+        """
+        Starts HTTP server.
+
+        Args:
+            host: Listening address.
+            port: Listening port.
+        """
+
+        self._runner = web.AppRunner(self.make_app())
+
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+
+        _LOGGER.info("Serving on http://%s:%d/", host, port)
+
+    async def close(self) -> None:
+        """Stops HTTP server and cancels origin fetches."""
+
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+        for x in self._tasks:
+            x.cancel()
+
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+        if self._close_connector:
+            await self._cli.close()
+
+    def track_url(self, base: URL, url: URL) -> URL:
+        """
+        Returns local URL of origin track.
+
+        Args:
+            base: Base URL of this server.
+            url: Origin track URL.
+        """
+
+        path = f"/track/{url.raw_host}{url.raw_path}"
+
+        return base.join(URL(path, encoded=True))
+
+    async def _get_page(self, request: web.Request) -> PagesSupported:
+        path = request.match_info["path"] or None
+
+        # Only relative links to origin pages. Prevents requests to any host.
+        if path is not None and ((x := URL(path)).scheme or x.host is not None):
+            raise web.HTTPForbidden(reason="Only origin pages are allowed.")
+
+        try:
+            npage = int(x) if (x := request.query.get("page")) else None
+
+        except ValueError:
+            raise web.HTTPBadRequest(reason="Invalid page number.") from None
+
+        try:
+            if path is None:
+                return await self._browser.page()
+
+            return await self._browser.page(path, npage=npage)
+
+        except ParseError as e:
+            raise web.HTTPNotFound(reason=str(e)) from None
+
+    async def _page(self, request: web.Request) -> web.Response:
+        page = await self._get_page(request)
+        text = json.dumps(page, default=json_default, ensure_ascii=False)
+
+        return web.json_response(text=text)
+
+    async def _playlist(self, request: web.Request) -> web.Response:
+        try:
+            format = AudioFormat(request.query.get("format", "mp3").lower())
+
+        except ValueError:
+            raise web.HTTPBadRequest(reason="Unknown audio format.") from None
+
+        if not isinstance(page := await self._get_page(request), GamePage):
+            raise web.HTTPNotFound(reason="Not a game page.")
+
+        try:
+            m3u = page.m3u(
+                format,
+                rewrite=lambda x: self.track_url(request.url.origin(), x),
+            )
+
+        except FileNotFoundError:
+            raise web.HTTPNotFound(reason="Audio format unavailable.") from None
+
+        return web.Response(text=m3u, content_type="audio/x-mpegurl")
+
+    def _download(self, url: URL) -> _Download:
+        key = str(url)
+
+        if (download := self._downloads.get(key)) is None:
+            name = hashlib.sha256(key.encode()).hexdigest() + url.suffix
+            download = _Download(self._cache_dir / name)
+
+            if not download.path.exists():
+                self._downloads[key] = download
+                task = asyncio.create_task(download.run(self._cli, url))
+                self._tasks.add(task)
+
+                def done(task: asyncio.Task) -> None:
+                    self._tasks.discard(task)
+                    del self._downloads[key]
+
+                task.add_done_callback(done)
+
+        return download
+
+    async def _track(self, request: web.Request) -> web.StreamResponse:
+        if (origin := self._origin(request.match_info["host"])) is None:
+            raise web.HTTPForbidden(reason="Unknown origin host.")
+
+        path = "/" + request.match_info["path"]
+        download = self._download(origin.with_path(path))
+
+        if download.path.exists():
+            # Cached. Ranges and conditional requests are handled by aiohttp.
+            return web.FileResponse(download.path)
+
+        await download.started.wait()
+
+        if download.error is not None:
+            raise web.HTTPBadGateway(reason="Origin fetch failed.")
+
+        if download.done:
+            return web.FileResponse(download.path)
+
+        # Opened before any await. Fetch may rename or remove partial file
+        # before response is prepared.
+        with download.part.open("rb") as f:
+            return await self._stream(request, download, f)
+
+    async def _stream(
+        self,
+        request: web.Request,
+        download: _Download,
+        f: BinaryIO,
+    ) -> web.StreamResponse:
+        # Streams partial file while origin fetch is in progress.
+        start, stop, total = 0, download.total, download.total
+        response = web.StreamResponse()
+
+        try:
+            rng = request.http_range
+
+        except ValueError:
+            rng = slice(None)
+
+        if total is not None and (rng.start, rng.stop) != (None, None):
+            start, stop, _ = rng.indices(total)
+
+            if start >= stop:
+                raise web.HTTPRequestRangeNotSatisfiable(
+                    headers={"Content-Range": f"bytes */{total}"}
+                )
+
+            response.set_status(206)
+            response.headers["Content-Range"] = (
+                f"bytes {start}-{stop - 1}/{total}"
+            )
+
+        if total is not None:
+            response.headers["Accept-Ranges"] = "bytes"
+
+        if stop is not None:
+            response.content_length = stop - start
+
+        response.content_type = download.content_type
+        await response.prepare(request)
+
+        f.seek(pos := start)
+
+        while stop is None or pos < stop:
+            if pos >= download.size:
+                if download.done:
+                    break
+
+                await download.wait(pos)
+                continue
+
+            end = download.size if stop is None else min(stop, download.size)
+            chunk = f.read(min(end - pos, _CHUNK_SIZE))
+            await response.write(chunk)
+            pos += len(chunk)
+
+        if download.error is not None:
+            # Abort connection. Client must not take truncated data as full.
+            raise ConnectionResetError("Origin fetch failed.")
+
+        await response.write_eof()
+
+        return response
@@ -0,0 +1,326 @@
+import asyncio
+import concurrent.futures
+import logging
+import threading
+from typing import Any, Callable, Coroutine, Final, Iterable
+
+from .browser import PageLink, ZopharBrowser
+from .parsers import (
+    GameEntry,
+    GameListPage,
+    GamePage,
+    InfoPage,
+    Menu,
+    PagesSupported,
+)
+from .profiling import MemoryProfiler
+from .transport import Transport
+
+_LOGGER: Final = logging.getLogger(__name__)
+
+
+class SyncZopharBrowser:
+    """
+    Thread-safe synchronous Zophar's Game Music browser.
+
+    Owns one long-lived `ZopharBrowser` running on a dedicated background
+    event loop thread. Blocking methods may be called from many threads at
+    once and share one connection pool and pages cache.
+    """
+
+    _loop: asyncio.AbstractEventLoop
+    _thread: threading.Thread
+    _browser: ZopharBrowser | None
+    _transport: Transport | None
+    _timeout: float | None
+    _lock: threading.Lock
+    _closing: bool
+    _futures: set[concurrent.futures.Future]
+
+    def __init__(
+        self,
+        *,
+        transport_factory: Callable[[], Transport] | None = None,
+        profiler: MemoryProfiler | None = None,
+        timeout: float | None = None,
+    ) -> None:
+        """
+        Starts background event loop thread and opens browser.
+
+        Args:
+            transport_factory: Factory of custom transport. Called in
+                background event loop, since HTTP sessions are bound to it.
+            profiler: Optional memory profiler of operations.
+            timeout: Timeout of each blocking call in seconds.
+        """
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever,
+            name="zophar",
+            daemon=True,
+        )
+        self._browser = None
+        self._transport = None
+        self._timeout = timeout
+        self._lock = threading.Lock()
+        self._closing = False
+        self._futures = set()
+
+        self._thread.start()
+
+        async def open() -> ZopharBrowser:
+            self._transport = transport_factory and transport_factory()
+            browser = ZopharBrowser(
+                transport=self._transport, profiler=profiler
+            )
+
+            try:
+                await browser.open()
+
+            except BaseException:
+                # Closes own transport of browser. Custom one is closed later.
+                await browser.close()
+                raise
+
+            return browser
+
+        try:
+            self._browser = self._run(open())
+
+        except BaseException:
+            self._closing = True
+            self._stop(None)
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _run[T](self, coro: Coroutine[Any, Any, T]) -> T:
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("Blocking call from browser event loop thread.")
+
+        # Submission is atomic with closing. Calls are never left in loop
+        # after shutdown.
+        with self._lock:
+            if self._closing or not self._thread.is_alive():
+                coro.close()
+                raise RuntimeError("Browser is closed.")
+
+            future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+            self._futures.add(future)
+
+        try:
+            return future.result(self._timeout)
+
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+        finally:
+            with self._lock:
+                self._futures.discard(future)
+
+    async def _shutdown(self, browser: ZopharBrowser | None) -> None:
+        # Cancels pending calls (timed out, etc.) before closing transport.
+        current = asyncio.current_task()
+        tasks = [x for x in asyncio.all_tasks() if x is not current]
+
+        for x in tasks:
+            x.cancel()
+
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        if browser is not None:
+            await browser.close()
+
+        if self._transport is not None:
+            await self._transport.close()
+
+    def _stop(self, browser: ZopharBrowser | None) -> None:
+        try:
+            coro = self._shutdown(browser)
+            asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+
+            # Fails calls not completed by shutdown. Waiters must not hang.
+            with self._lock:
+                futures, self._futures = self._futures, set()
+
+            for x in futures:
+                if not x.done():
+                    x.set_exception(RuntimeError("Browser is closed."))
+
+    def _get_browser(self) -> ZopharBrowser:
+        if (browser := self._browser) is None:
+            raise RuntimeError("Browser is closed.")
+
+        return browser
+
+    def close(self) -> None:
+        """Closes browser and stops background event loop thread."""
+
+        with self._lock:
+            if self._closing:
+                return
+
+            self._closing = True
+            browser, self._browser = self._browser, None
+
+        self._stop(browser)
+
+        _LOGGER.debug("Browser closed.")
+
+    @property
+    def menu(self) -> Menu:
+        """Main menu. Tree walking starting from here."""
+
+        return self._get_browser().menu
+
+    @property
+    def consoles(self) -> list[str]:
+        """Available consoles (hardware platforms). Used for searching."""
+
+        return self._get_browser().consoles
+
+    def page(
+        self,
+        link: PageLink | None = None,
+        *,
+        npage: int | None = None,
+    ) -> PagesSupported:
+        """
+        Generic parser of all supported pages.
+
+        Args:
+            link: Any of supported link types. Default: random game page.
+            npage: Page number (used for game lists only). Default is first page.
+
+        Returns:
+            Instance of page entity.
+        """
+
+        return self._run(self._get_browser().page(link, npage=npage))
+
+    def gamelist_page(
+        self,
+        link: PageLink,
+        *,
+        npage: int | None = None,
+    ) -> GameListPage:
+        """
+        Gets and parses the specified game list page.
+
+        Args:
+            link: Any supported page link type.
+            npage: Page number. The default is the first page.
+
+        Returns:
+            Instance of the game list page entity `GameListPage`.
+        """
+
+        browser = self._get_browser()
+
+        return self._run(browser.gamelist_page(link, npage=npage))
+
+    def gamelist(self, link: PageLink) -> list[GameEntry]:
+        """
+        Scrapes all game list.
+
+        Args:
+            link: Any of supported link types.
+
+        Returns:
+            Game entries list.
+        """
+
+        return self._run(self._get_browser().gamelist(link))
+
+    def infopage(self, link: PageLink) -> InfoPage:
+        """
+        Scrapes info pages (developers, publishers lists).
+
+        Args:
+            link: Any of supported link types.
+
+        Returns:
+            Items list.
+        """
+
+        return self._run(self._get_browser().infopage(link))
+
+    def gamepage(self, link: PageLink | None = None) -> GamePage:
+        """
+        Returns game page.
+
+        Args:
+            link: Any of supported link types. Default: random game page.
+
+        Returns:
+            Instance of `GamePage`.
+        """
+
+        return self._run(self._get_browser().gamepage(link))
+
+    def gamepages(self, links: Iterable[PageLink | None]) -> list[GamePage]:
+        """
+        Scrapes games pages concurrently.
+
+        Args:
+            links: Iterable of any supported link types.
+
+        Returns:
+            List of `GamePage` instances.
+        """
+
+        return self._run(self._get_browser().gamepages(list(links)))
+
+    def search(
+        self,
+        context: str,
+        *,
+        console: str | None = None,
+    ) -> GameListPage:
+        """
+        Search games by context and optionally filtered by platform ID.
+
+        Args:
+            context: Game search context.
+            console: Filter by hardware platform (default: All).
+
+        Returns:
+            Instance of `GameListPage`.
+        """
+
+        browser = self._get_browser()
+
+        return self._run(browser.search(context, console=console))
+
+    def search_many(
+        self,
+        contexts: Iterable[str],
+        *,
+        console: str | None = None,
+    ) -> list[GameEntry]:
+        """
+        Search games by many contexts concurrently.
+
+        Args:
+            contexts: Iterable of game search contexts.
+            console: Filter by hardware platform (default: All).
+
+        Returns:
+            Merged list of unique game entries in order of contexts.
+        """
+
+        browser = self._get_browser()
+
+        return self._run(browser.search_many(list(contexts), console=console))
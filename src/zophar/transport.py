@@ -0,0 +1,316 @@
+import asyncio
+import contextlib
+import dataclasses as dc
+import gzip
+import json
+import logging
+import os
+import random
+from typing import AsyncIterator, Final, Mapping, Protocol
+
+import aiohttp
+from yarl import URL
+
+_LOGGER: Final = logging.getLogger(__name__)
+
+_ARCHIVE_VERSION: Final = 1
+
+
+@dc.dataclass(slots=True, frozen=True)
+class Response:
+    """Transport response. Contains only data used by browser."""
+
+    status: int
+    """HTTP status code"""
+    text: str = ""
+    """Decoded response body"""
+    location: str | None = None
+    """Value of `location` header. Used for redirections."""
+
+
+_NOT_FOUND: Final = Response(404)
+
+type RecordKey = tuple[str, bool]
+"""Request URL and `allow_redirects` flag"""
+
+
+class Transport(Protocol):
+    """Transport interface used by `ZopharBrowser`"""
+
+    async def get(
+        self,
+        url: URL,
+        *,
+        allow_redirects: bool = True,
+    ) -> Response:
+        """
+        Performs GET request.
+
+        Args:
+            url: Absolute request URL.
+            allow_redirects: Follow redirections.
+
+        Returns:
+            Instance of `Response`.
+        """
+        ...
+
+    async def close(self) -> None:
+        """Releases transport resources"""
+        ...
+
+
+class HttpTransport:
+    """Network transport based on `aiohttp.ClientSession`"""
+
+    _cli: aiohttp.ClientSession
+    _close_connector: bool
+
+    def __init__(self, session: aiohttp.ClientSession | None = None) -> None:
+        self._cli = session or aiohttp.ClientSession()
+        self._close_connector = session is None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Underlying HTTP client session"""
+
+        return self._cli
+
+    async def get(
+        self,
+        url: URL,
+        *,
+        allow_redirects: bool = True,
+    ) -> Response:
+        async with self._cli.get(url, allow_redirects=allow_redirects) as x:
+            return Response(
+                status=x.status,
+                text=await x.text(),
+                location=x.headers.get("location"),
+            )
+
+    async def close(self) -> None:
+        """Closes HTTPS client session"""
+
+        if self._close_connector:
+            await self._cli.close()
+
+
+class RecordingTransport:
+    """Records all responses of wrapped transport for later replay."""
+
+    _transport: Transport
+    _records: dict[RecordKey, Response]
+
+    def __init__(self, transport: Transport | None = None) -> None:
+        self._transport = transport or HttpTransport()
+        self._records = {}
+
+    @property
+    def records(self) -> Mapping[RecordKey, Response]:
+        """Recorded responses by request URL and `allow_redirects` flag"""
+
+        return self._records
+
+    async def get(
+        self,
+        url: URL,
+        *,
+        allow_redirects: bool = True,
+    ) -> Response:
+        response = await self._transport.get(
+            url, allow_redirects=allow_redirects
+        )
+
+        self._records[str(url), allow_redirects] = response
+
+        return response
+
+    async def close(self) -> None:
+        """Closes wrapped transport"""
+
+        await self._transport.close()
+
+    def save(self, path: str | os.PathLike[str]) -> None:
+        """
+        Saves recorded responses to compressed archive.
+
+        Args:
+            path: Archive file path.
+        """
+
+        _save_archive(path, self._records)
+
+        _LOGGER.debug("Saved %d records to '%s'.", len(self._records), path)
+
+
+class ReplayTransport:
+    """Serves recorded responses from memory. Network is never used."""
+
+    _records: Mapping[RecordKey, Response]
+    _latency: float
+    _jitter: float
+
+    def __init__(
+        self,
+        records: Mapping[RecordKey, Response],
+        *,
+        latency: float = 0,
+        jitter: float = 0,
+    ) -> None:
+        """
+        Args:
+            records: Responses by request URL and `allow_redirects` flag.
+            latency: Delay of every response in seconds.
+            jitter: Upper bound of random delay added to `latency`.
+        """
+
+        if latency < 0 or jitter < 0:
+            raise ValueError("Latency and jitter must be non-negative.")
+
+        self._records = records
+        self._latency = latency
+        self._jitter = jitter
+
+    @classmethod
+    def load(
+        cls,
+        path: str | os.PathLike[str],
+        *,
+        latency: float = 0,
+        jitter: float = 0,
+    ) -> "ReplayTransport":
+        """
+        Loads recorded responses from archive.
+
+        Args:
+            path: Archive file path.
+            latency: Delay of every response in seconds.
+            jitter: Upper bound of random delay added to `latency`.
+
+        Returns:
+            Instance of `ReplayTransport`.
+        """
+
+        records = _load_archive(path)
+
+        _LOGGER.debug("Loaded %d records from '%s'.", len(records), path)
+
+        return cls(records, latency=latency, jitter=jitter)
+
+    async def get(
+        self,
+        url: URL,
+        *,
+        allow_redirects: bool = True,
+    ) -> Response:
+        if delay := self._latency + random.uniform(0, self._jitter):
+            await asyncio.sleep(delay)
+
+        # Missing records are served as `404 Not Found`.
+        return self._records.get((str(url), allow_redirects), _NOT_FOUND)
+
+    async def close(self) -> None:
+        pass
+
+
+class ThrottledTransport:
+    """Limits concurrency and request rate of wrapped transport."""
+
+    _transport: Transport
+    _semaphore: asyncio.Semaphore | None
+    _interval: float
+    _next: float
+
+    def __init__(
+        self,
+        transport: Transport,
+        *,
+        limit: int | None = None,
+        rate: float | None = None,
+    ) -> None:
+        """
+        Args:
+            transport: Wrapped transport.
+            limit: Maximum number of concurrent requests. Default: unlimited.
+            rate: Maximum number of requests per second. Default: unlimited.
+        """
+
+        if limit is not None and limit < 1:
+            raise ValueError("Limit must be positive.")
+
+        if rate is not None and rate <= 0:
+            raise ValueError("Rate must be positive.")
+
+        self._transport = transport
+        self._semaphore = asyncio.Semaphore(limit) if limit else None
+        self._interval = 1 / rate if rate else 0
+        self._next = 0
+
+    async def _wait(self) -> None:
+        now = asyncio.get_running_loop().time()
+        delay, self._next = self._next - now, max(now, self._next)
+        self._next += self._interval
+
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    @contextlib.asynccontextmanager
+    async def throttle(self) -> AsyncIterator[None]:
+        """
+        Holds one request slot. Used for requests made bypassing transport,
+        like streaming downloads.
+        """
+
+        async with self._semaphore or contextlib.nullcontext():
+            if self._interval:
+                await self._wait()
+
+            yield
+
+    async def get(
+        self,
+        url: URL,
+        *,
+        allow_redirects: bool = True,
+    ) -> Response:
+        async with self.throttle():
+            return await self._transport.get(
+                url, allow_redirects=allow_redirects
+            )
+
+    async def close(self) -> None:
+        """Closes wrapped transport"""
+
+        await self._transport.close()
+
+
+def _save_archive(
+    path: str | os.PathLike[str],
+    records: Mapping[RecordKey, Response],
+) -> None:
+    data = {
+        "version": _ARCHIVE_VERSION,
+        "records": [
+            [url, redirects, x.status, x.location, x.text]
+            for (url, redirects), x in records.items()
+        ],
+    }
+
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        json.dump(data, f, separators=(",", ":"))
+
+
+def _load_archive(
+    path: str | os.PathLike[str],
+) -> dict[RecordKey, Response]:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        data = json.load(f)
+
+    if (version := data.get("version")) != _ARCHIVE_VERSION:
+        raise ValueError(f"Unsupported archive version '{version}'.")
+
+    return {
+        (url, redirects): Response(status=status, text=text, location=location)
+        for url, redirects, status, location, text in data["records"]
+    }
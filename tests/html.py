@@ -0,0 +1,57 @@
+"""Synthetic HTML pages in the format of Zophar's Domain Music."""
+
+BASE = "https://www.zophar.net/music/"
+
+
+def searchpage(consoles: dict[str, str]) -> str:
+    menu = "".join(f'<a href="/music/{v}">{k}</a>' for k, v in consoles.items())
+    options = "".join(
+        f'<option value="{i}">{k}</option>' for i, k in enumerate(consoles, 1)
+    )
+
+    return (
+        f'<div id="sidebarSearch"><h2>Consoles</h2>{menu}</div>'
+        '<div id="searchsearch"><select><option value="0">All</option>'
+        f"{options}</select></div>"
+    )
+
+
+def gamelistpage(
+    paths: list[str],
+    *,
+    npage: int = 1,
+    total_pages: int = 1,
+    description: str = "Description",
+) -> str:
+    rows = "".join(
+        f'<tr><td class="image"><img src="/thumbs_small/{i}.jpg"></td>'
+        f'<td class="name"><a href="/music/{x}">Game {x}</a></td></tr>'
+        for i, x in enumerate(paths)
+    )
+
+    counter = ""
+
+    if total_pages > 1:
+        counter = f'<p class="counter">Page {npage} of {total_pages}</p>'
+
+    return (
+        f'<div id="gamelistpage"><h2>Title</h2><p>{description}</p>{counter}'
+        f"<table><tr><th>Header</th></tr>{rows}<tr><th>Header</th></tr>"
+        "</table></div>"
+    )
+
+
+def gamepage(name: str = "Game", *, tracks: int = 2) -> str:
+    rows = "".join(
+        f"<tr><td>{i}</td><td>Track {i}</td><td>1:{i:02}</td>"
+        f'<td><a href="https://fi.zophar.net/x/{i}.mp3">MP3</a></td></tr>'
+        for i in range(1, tracks + 1)
+    )
+
+    return (
+        '<div id="gamepage"><div id="music_cover"><img src="https://x/c.jpg">'
+        f'</div><div id="music_info"><h2>{name}</h2><p><span>Console:</span>'
+        '<span>NES</span></p></div><div id="mass_download">'
+        '<a href="https://fi.zophar.net/x/mp3.zip"><p>Download all files as '
+        f'MP3</p></a></div><table id="tracklist">{rows}</table></div>'
+    )
@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+
+from zophar import ReplayTransport, Response, ZopharBrowser
+
+from .html import BASE, gamelistpage, searchpage
+
+_CONSOLES = {"NES": "nintendo-nes-nsf", "Game Boy": "gameboy-gbs"}
+
+_RECORDS = {
+    (f"{BASE}search", True): Response(200, searchpage(_CONSOLES)),
+    (f"{BASE}search?search=mario", False): Response(
+        200,
+        gamelistpage(
+            ["nintendo-nes-nsf/mario", "gameboy-gbs/mario"],
+            description="2 results",
+        ),
+    ),
+}
+
+
+def test_search_filtered_from_cache():
+    async def search():
+        async with ZopharBrowser(transport=ReplayTransport(_RECORDS)) as x:
+            unfiltered = await x.search(" Mario ")
+            filtered = await x.search("mario", console="NES")
+
+            # Derived pages never replace pages loaded from origin.
+            assert len(x._cache) == 1
+            assert await x.search("MARIO", console="NES") is filtered
+
+            return unfiltered, filtered
+
+    unfiltered, filtered = asyncio.run(search())
+
+    assert [x.path for x in unfiltered.entries] == [
+        "nintendo-nes-nsf/mario",
+        "gameboy-gbs/mario",
+    ]
+    assert [x.path for x in filtered.entries] == ["nintendo-nes-nsf/mario"]
+    assert unfiltered.description == "2 results"
+    assert filtered.description == ""
+
+
+def test_search_many_unknown_console():
+    async def search():
+        async with ZopharBrowser(transport=ReplayTransport(_RECORDS)) as x:
+            await x.search_many(["mario", "zelda"], console="Unknown")
+
+    with pytest.raises(ValueError, match="Unknown console"):
+        asyncio.run(search())
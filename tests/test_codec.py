@@ -0,0 +1,99 @@
+import datetime as dt
+import mmap
+
+import pytest
+from yarl import URL
+
+from zophar import AudioFormat, GameListPage, GamePage, InfoPage
+from zophar.codec import ListView, RecordView, dumps, loads, view
+from zophar.parsers import AudioTrack, Browsable, GameEntry
+
+_GAMELIST = GameListPage(
+    entries=[
+        GameEntry("Mario", "nes/mario", cover=URL("https://x/m.jpg")),
+        GameEntry("Zelda", "nes/zelda", cover=None),
+    ],
+    title="NES",
+    description="Всего 2 игры",
+    page=3,
+    total_pages=7,
+)
+
+_GAME = GamePage(
+    name="Mario",
+    console="NES",
+    cover=None,
+    release_date="1985",
+    developer=None,
+    publisher="Nintendo",
+    originals=None,
+    archives={AudioFormat.FLAC: URL("https://fi.zophar.net/x/flac.zip")},
+    tracks=(
+        AudioTrack(
+            "Title", dt.timedelta(seconds=75.5), URL("https://x/1%20a.mp3")
+        ),
+        AudioTrack("End", dt.timedelta(), URL("https://x/2.mp3")),
+    ),
+)
+
+_INFO = InfoPage(
+    entries=[Browsable("Capcom", "developer/capcom")],
+    description="",
+)
+
+
+@pytest.mark.parametrize("page", [_GAMELIST, _GAME, _INFO])
+def test_round_trip(page):
+    assert loads(dumps(page)) == page
+    assert view(dumps(page)).materialize() == page
+
+
+def test_round_trip_empty():
+    page = GamePage(
+        name="",
+        console="",
+        cover=URL("https://x/c.jpg"),
+        originals=URL("https://x/nsf.zip"),
+        archives={},
+        tracks=(),
+    )
+
+    assert loads(dumps(page)) == page
+
+
+def test_lazy_view():
+    with mmap.mmap(-1, len(data := dumps(_GAMELIST))) as buf:
+        buf.write(data)
+
+        x = view(buf)
+
+        assert x.type is GameListPage
+        assert x.total_pages == 7
+        assert isinstance(entries := x.entries, ListView)
+        assert len(entries) == 2
+        assert isinstance(entry := entries[-1], RecordView)
+        assert (entry.name, entry.cover) == ("Zelda", None)
+        assert entries[0].materialize() == _GAMELIST.entries[0]
+        assert [x.path for x in entries[:5]] == ["nes/mario", "nes/zelda"]
+
+        with pytest.raises(IndexError):
+            entries[2]
+
+        with pytest.raises(AttributeError):
+            entry.unknown
+
+        del x, entries, entry
+
+
+@pytest.mark.parametrize(
+    "data",
+    [b"", b"ZPH", b"XXXX\x01\x00\x00\x00", b"ZPHR\x02\x00\x00\x00"],
+)
+def test_invalid_header(data):
+    with pytest.raises(ValueError):
+        view(data)
+
+
+def test_invalid_page_type():
+    with pytest.raises(ValueError, match="page type"):
+        view(b"ZPHR\x01\x07\x00\x00")
@@ -0,0 +1,48 @@
+import asyncio
+import subprocess
+import sys
+
+from yarl import URL
+
+from zophar import RecordingTransport, ReplayTransport, Response
+
+from .html import BASE, gamepage, searchpage
+
+_RECORDS = {
+    (f"{BASE}search", True): Response(200, searchpage({})),
+    (f"{BASE}nes/game", False): Response(200, gamepage()),
+}
+
+
+def _archive(path):
+    async def record():
+        recorder = RecordingTransport(ReplayTransport(_RECORDS))
+
+        for url, redirects in _RECORDS:
+            await recorder.get(URL(url), allow_redirects=redirects)
+
+        recorder.save(path)
+
+    asyncio.run(record())
+
+
+def test_closed_output(tmp_path):
+    _archive(archive := tmp_path / "archive.json.gz")
+    (links := tmp_path / "links.txt").write_text("nes/game\n" * 2000)
+
+    # Like `zophar pages ... | head -1`.
+    with subprocess.Popen(
+        [sys.executable, "-m", "zophar", "pages", "--replay", archive, links],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    ) as proc:
+        try:
+            assert proc.stdout.readline().startswith(b'{"link": "nes/game"')
+
+            proc.stdout.close()
+
+            assert proc.wait(timeout=30) == 1
+            assert proc.stderr.read() == b""
+
+        finally:
+            proc.kill()
@@ -0,0 +1,71 @@
+import asyncio
+
+from zophar import MemoryProfiler, ReplayTransport, Response, ZopharBrowser
+from zophar.parsers.types import PageType
+
+from .html import BASE, gamelistpage, searchpage
+
+_PAGES = 50
+_ENTRIES = 200
+
+# Measured peak of gamelist is about 14.2 MiB. Budget catches 1.7x growth.
+_BUDGET = 24 * 1024 * 1024
+
+
+def _records(pages: int) -> dict[tuple[str, bool], Response]:
+    records = {(f"{BASE}search", True): Response(200, searchpage({}))}
+
+    for n in range(1, pages + 1):
+        url = f"{BASE}big" if n == 1 else f"{BASE}big?page={n}"
+        paths = [f"nes/game-{n}-{i}" for i in range(_ENTRIES)]
+        html = gamelistpage(paths, npage=n, total_pages=pages)
+        records[url, False] = Response(200, html)
+
+    return records
+
+
+def _gamelist(profiler: MemoryProfiler, pages: int) -> list:
+    records = _records(pages)
+    transport = ReplayTransport(records, latency=0.001, jitter=0.001)
+
+    async def gamelist():
+        async with ZopharBrowser(transport=transport, profiler=profiler) as x:
+            return await x.gamelist("big")
+
+    with profiler:
+        return asyncio.run(gamelist())
+
+
+def test_gamelist_budget():
+    # Snapshots are too slow for 50 pages. Peak does not depend on them.
+    profiler = MemoryProfiler(snapshots=False)
+
+    assert len(_gamelist(profiler, _PAGES)) == _PAGES * _ENTRIES
+    profiler.check_budget("gamelist", _BUDGET)
+
+    stats = profiler.stats
+    gamelist, parse = PageType.GameListPage, ("parse", PageType.GameListPage)
+
+    assert stats["gamelist", gamelist].calls == 1
+    assert stats["page", gamelist].calls == _PAGES
+    assert stats[parse].calls == _PAGES
+    # Concurrent operations have no net size. Parsed pages stay in cache.
+    assert stats["page", gamelist].size is None
+    assert stats[parse].size > 0
+    assert stats[parse].allocations is None
+
+
+def test_parse_allocations():
+    profiler = MemoryProfiler()
+
+    assert len(_gamelist(profiler, 2)) == 2 * _ENTRIES
+
+    stats = profiler.stats
+    parse = stats["parse", PageType.GameListPage]
+
+    assert parse.calls == 2
+    assert parse.size > 0
+    # Parsed entries stay in cache: at least entry and its strings.
+    assert parse.allocations > 2 * _ENTRIES
+    assert stats["gamelist", PageType.GameListPage].allocations is None
+    assert str(parse.allocations) in profiler.report()
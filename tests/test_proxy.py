@@ -0,0 +1,147 @@
+import asyncio
+
+import aiohttp
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+
+from zophar import ReplayTransport, Response, ZopharBrowser
+from zophar.proxy import ZopharProxy
+
+from .html import BASE, gamepage, searchpage
+
+_RECORDS = {
+    (f"{BASE}search", True): Response(200, searchpage({"NES": "nes"})),
+    (f"{BASE}nes/game", False): Response(200, gamepage()),
+}
+
+_TRACK = bytes(range(256)) * 1024
+_TRACK_PATH = "/track/fi.zophar.net/x/1.mp3"
+
+
+def _origin_app(hits: list[str], release: asyncio.Event) -> web.Application:
+    # Sends head of track and stalls until released.
+    async def track(request: web.Request) -> web.StreamResponse:
+        hits.append(request.path)
+
+        response = web.StreamResponse()
+        response.content_length = len(_TRACK)
+        response.content_type = "audio/mpeg"
+
+        await response.prepare(request)
+        await response.write(_TRACK[:1000])
+        await release.wait()
+        await response.write(_TRACK[1000:])
+
+        return response
+
+    app = web.Application()
+    app.router.add_get("/x/{name}", track)
+
+    return app
+
+
+def test_page_origin_only(tmp_path):
+    async def get(paths):
+        browser = ZopharBrowser(transport=ReplayTransport(_RECORDS))
+
+        async with browser, ZopharProxy(browser, tmp_path) as proxy:
+            async with TestClient(TestServer(proxy.make_app())) as client:
+                return [(await client.get(x)).status for x in paths]
+
+    assert asyncio.run(
+        get(
+            [
+                "/page/nes/game",
+                "/page/https://evil.example/x",
+                "/page/http:%2F%2F169.254.169.254/latest",
+                "/page///evil.example/x",
+            ]
+        )
+    ) == [200, 403, 403, 403]
+
+
+def test_browser_session(tmp_path):
+    async def sessions():
+        async with aiohttp.ClientSession() as session:
+            browser = ZopharBrowser(session=session)
+
+            async with ZopharProxy(browser, tmp_path) as proxy:
+                assert proxy._cli is session
+
+            assert not session.closed
+
+            browser = ZopharBrowser(transport=ReplayTransport({}))
+
+            async with ZopharProxy(browser, tmp_path) as proxy:
+                assert proxy._cli is not session
+
+            assert proxy._cli.closed
+
+    asyncio.run(sessions())
+
+
+def test_track_streaming(tmp_path):
+    total = len(_TRACK)
+    hits: list[str] = []
+
+    async def serve():
+        release = asyncio.Event()
+        browser = ZopharBrowser(transport=ReplayTransport(_RECORDS))
+
+        async with TestServer(_origin_app(hits, release)) as origin:
+
+            def resolve(host: str):
+                return origin.make_url("/") if host == "fi.zophar.net" else None
+
+            async with (
+                browser,
+                ZopharProxy(browser, tmp_path, origin=resolve) as proxy,
+                TestClient(TestServer(proxy.make_app())) as client,
+            ):
+
+                async def get(range: str | None = None):
+                    headers = {"Range": range} if range else {}
+
+                    async with client.get(_TRACK_PATH, headers=headers) as x:
+                        return (
+                            x.status,
+                            x.headers.get("Content-Range"),
+                            await x.read(),
+                        )
+
+                playlist = await client.get("/playlist/nes/game")
+                assert (
+                    str(client.make_url(_TRACK_PATH)) in await playlist.text()
+                )
+
+                assert (
+                    await client.get("/track/evil.net/x/1.mp3")
+                ).status == 403
+
+                # Listeners of partial fetch.
+                tasks = [
+                    asyncio.create_task(get(x))
+                    for x in [None] * 5
+                    + ["bytes=10-19", "bytes=-5", f"bytes={total}-"]
+                ]
+
+                await asyncio.sleep(0.2)
+                release.set()
+
+                streamed = await asyncio.gather(*tasks)
+                cached = [await get(), await get("bytes=10-19")]
+
+        return streamed, cached
+
+    streamed, cached = asyncio.run(serve())
+
+    assert hits == ["/x/1.mp3"]
+    assert streamed[:7] == [(200, None, _TRACK)] * 5 + [
+        (206, f"bytes 10-19/{total}", _TRACK[10:20]),
+        (206, f"bytes {total - 5}-{total - 1}/{total}", _TRACK[-5:]),
+    ]
+    assert streamed[7][:2] == (416, f"bytes */{total}")
+    assert cached[0] == (200, None, _TRACK)
+    assert cached[1][0::2] == (206, _TRACK[10:20])
+    # Only complete track stays in cache.
+    assert [x.suffix for x in tmp_path.iterdir()] == [".mp3"]
@@ -0,0 +1,65 @@
+import asyncio
+import concurrent.futures
+import threading
+
+import pytest
+from yarl import URL
+
+from zophar import ReplayTransport, Response, SyncZopharBrowser
+
+from .html import BASE, gamepage, searchpage
+
+_RECORDS = {
+    (f"{BASE}search", True): Response(200, searchpage({})),
+    (f"{BASE}nes/game", False): Response(200, gamepage()),
+}
+
+
+class _StalledTransport(ReplayTransport):
+    # Pages are never loaded. Search page is served at once.
+    async def get(self, url: URL, *, allow_redirects: bool = True) -> Response:
+        if not allow_redirects:
+            await asyncio.sleep(60)
+
+        return await super().get(url, allow_redirects=allow_redirects)
+
+
+def test_page():
+    with SyncZopharBrowser(
+        transport_factory=lambda: ReplayTransport(_RECORDS)
+    ) as browser:
+        assert browser.page("nes/game").name == "Game"
+
+    with pytest.raises(RuntimeError, match="closed"):
+        browser.page("nes/game")
+
+
+def test_close_fails_pending_calls():
+    browser = SyncZopharBrowser(
+        transport_factory=lambda: _StalledTransport(_RECORDS)
+    )
+
+    started = threading.Event()
+    errors: list[BaseException] = []
+
+    def call() -> None:
+        started.set()
+
+        try:
+            browser.page("nes/game")
+
+        except BaseException as e:
+            errors.append(e)
+
+    with concurrent.futures.ThreadPoolExecutor(4) as pool:
+        tasks = [pool.submit(call) for _ in range(4)]
+        started.wait()
+        browser.close()
+
+        concurrent.futures.wait(tasks, timeout=5)
+
+    assert len(errors) == 4
+    assert all(
+        isinstance(x, (RuntimeError, concurrent.futures.CancelledError))
+        for x in errors
+    )
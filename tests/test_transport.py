@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+from yarl import URL
+
+from zophar import (
+    ParseError,
+    RecordingTransport,
+    ReplayTransport,
+    Response,
+    ZopharBrowser,
+)
+
+from .html import BASE
+
+_RANDOM = URL("https://www.zophar.net/random-music")
+
+_ORIGIN = {
+    (f"{BASE}nes", True): Response(200, "<html>nes</html>"),
+    (str(_RANDOM), False): Response(302, location=f"{BASE}nes/game"),
+    (str(_RANDOM), True): Response(200, "<html>game</html>"),
+}
+
+
+def test_record_and_replay(tmp_path):
+    path = tmp_path / "archive.json.gz"
+
+    async def record():
+        recorder = RecordingTransport(ReplayTransport(_ORIGIN))
+
+        await recorder.get(URL(f"{BASE}nes"))
+        await recorder.get(_RANDOM, allow_redirects=False)
+        await recorder.get(_RANDOM)
+        await recorder.close()
+
+        recorder.save(path)
+
+        return recorder.records
+
+    assert asyncio.run(record()) == _ORIGIN
+
+    async def replay():
+        replay = ReplayTransport.load(path)
+
+        return [
+            await replay.get(URL(f"{BASE}nes")),
+            await replay.get(_RANDOM, allow_redirects=False),
+            await replay.get(_RANDOM),
+            await replay.get(URL(f"{BASE}unknown")),
+        ]
+
+    page, redirect, followed, unknown = asyncio.run(replay())
+
+    assert page == Response(200, "<html>nes</html>")
+    assert redirect == Response(302, location=f"{BASE}nes/game")
+    assert followed == Response(200, "<html>game</html>")
+    assert unknown.status == 404
+
+
+def test_replay_latency():
+    async def measure(**kwargs) -> float:
+        replay = ReplayTransport(_ORIGIN, **kwargs)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+
+        await asyncio.gather(*(replay.get(URL(f"{BASE}nes")) for _ in range(5)))
+
+        return loop.time() - start
+
+    assert asyncio.run(measure()) < 0.05
+    assert 0.1 <= asyncio.run(measure(latency=0.1)) < 0.2
+    assert 0.1 <= asyncio.run(measure(latency=0.1, jitter=0.05)) < 0.3
+
+
+def test_replay_missing_search_page():
+    async def open():
+        async with ZopharBrowser(transport=ReplayTransport({})):
+            pass
+
+    with pytest.raises(ParseError, match="Search page not found"):
+        asyncio.run(open())